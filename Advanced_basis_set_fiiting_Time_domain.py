@@ -14,29 +14,19 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
-# GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
+import mrs_common
+from mrs_common import N, t, GIF_WRITER
 
+# GLOBAL
 T2 = 0.18
-decay = np.exp(-t/T2)
 
 fps = 30
 seconds = 15
 frames = fps*seconds
 
-# multiplet → FID
+# multiplet → FID (cached in mrs_common, with this script's T2)
 def multiplet(center, pattern, J=7):
-    sig = np.zeros_like(t, dtype=complex)
-    n = len(pattern)
-
-    for i,a in enumerate(pattern):
-        offset = (i-(n-1)/2)*J
-        f = center + offset
-        sig += a*np.exp(1j*2*np.pi*f*t)
-
-    return sig*decay
+    return mrs_common.multiplet(center, pattern, J, T2)
 
 # MOLECULES
 molecules = {
@@ -57,14 +47,19 @@ for name,data in molecules.items():
     true_conc.append(data["conc"])
 
 basis_fids = np.array(basis_fids)
-true_conc  = np.array(true_conc)
+true_conc  = np.array(true_conc, dtype=np.float32)
 
 real_sum = np.sum(basis_fids.T * true_conc, axis=1)
 
 # add noise
-noise = (np.random.randn(N)+1j*np.random.randn(N))*0.2
+noise = ((np.random.randn(N)+1j*np.random.randn(N))*0.2).astype(np.complex64)
 real_sum_noisy = real_sum + noise
 
+# displayed (real) traces; the fit is linear, so only the real
+# part of each basis is needed per frame
+basis_fids_re = np.real(basis_fids)
+real_sum_noisy_re = np.real(real_sum_noisy)
+
 # FIGURE
 fig, (ax1,ax2) = plt.subplots(2,1,figsize=(8,6))
 
@@ -88,8 +83,8 @@ def update(frame):
 
     # show real FID first
     if phase < 0.2:
-        real_line.set_data(t, np.real(real_sum_noisy))
-        return []
+        real_line.set_data(t, real_sum_noisy_re)
+        return real_line, fit_line, res_line
 
     # fitting phase
     fit_progress = min(1, (phase-0.2)/0.7)
@@ -97,16 +92,16 @@ def update(frame):
     # simulate iterative fitting
     est_conc = true_conc * fit_progress + np.random.randn(len(true_conc))*0.5*(1-fit_progress)
 
-    fitted = np.sum(basis_fids.T * est_conc, axis=1)
-    residual = real_sum_noisy - fitted
+    fitted = np.sum(basis_fids_re.T * est_conc, axis=1)
+    residual = real_sum_noisy_re - fitted
 
-    real_line.set_data(t, np.real(real_sum_noisy))
-    fit_line.set_data(t, np.real(fitted))
-    res_line.set_data(t, np.real(residual))
+    real_line.set_data(t, real_sum_noisy_re)
+    fit_line.set_data(t, fitted)
+    res_line.set_data(t, residual)
 
-    return []
+    return real_line, fit_line, res_line
 
-ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps)
-ani.save("time_domain_realistic_fit.gif", writer="pillow", fps=fps)
+ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps, blit=True)
+ani.save("time_domain_realistic_fit.gif", writer=GIF_WRITER, fps=fps)
 
 print("Saved: time_domain_realistic_fit.gif")
@@ -21,29 +21,19 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
-# GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
+import mrs_common
+from mrs_common import t, GIF_WRITER
 
+# GLOBAL
 T2 = 0.18
-decay = np.exp(-t/T2)
 
 fps = 30
 seconds = 15
 frames = fps*seconds
 
-# multiplet → FID
+# multiplet → FID (cached in mrs_common, with this script's T2)
 def multiplet(center, pattern, J=7):
-    sig = np.zeros_like(t, dtype=complex)
-    n = len(pattern)
-
-    for i,a in enumerate(pattern):
-        offset = (i-(n-1)/2)*J
-        f = center + offset
-        sig += a*np.exp(1j*2*np.pi*f*t)
-
-    return sig*decay
+    return mrs_common.multiplet(center, pattern, J, T2)
 
 # MOLECULE DEFINITIONS
 molecules = {
@@ -73,6 +63,11 @@ for name,data in molecules.items():
 
 real_sum = sum(real_fids.values())
 
+# displayed (real) traces, reused every frame
+real_fids_re   = {n: np.real(v) for n,v in real_fids.items()}
+basis_fids_re  = {n: np.real(v) for n,v in basis_fids.items()}
+real_sum_re = np.real(real_sum)
+
 # FIGURE
 fig, ax = plt.subplots(figsize=(8,4))
 ax.set_xlim(0,0.35)
@@ -89,67 +84,102 @@ sum_red,   = ax.plot([],[], color="red", lw=2, ls="--")
 labels_real  = {n: ax.text(0,0,"", fontsize=9) for n in molecules}
 labels_basis = {n: ax.text(0,0,"", fontsize=9, color="red") for n in molecules}
 
-# UPDATE
-def update(frame):
+# every artist update() may change (blitting redraws only these)
+animated = (list(black_lines.values()) + list(red_lines.values())
+            + [sum_black, sum_red]
+            + list(labels_real.values()) + list(labels_basis.values()))
 
-    phase = frame/frames
+# last static stage drawn (phase, molecules shown), so labels and
+# lines that do not change are only set when the stage changes
+last_stage = [None]
 
-    #PHASE 1 real FIDs
-    if phase < 0.3:
+#PHASE 1 real FIDs
+def phase1(phase):
 
-        k = int((phase/0.3)*len(molecules))
+    k = int((phase/0.3)*len(molecules))
+
+    if last_stage[0] != ("real", k):
+        last_stage[0] = ("real", k)
 
         for i,(name,data) in enumerate(molecules.items()):
             if i<=k:
 
-                y = np.real(real_fids[name])
+                y = real_fids_re[name]
                 black_lines[name].set_data(t, y)
 
                 labels_real[name].set_position((0.25, 18-4*i))
                 labels_real[name].set_text(f"{name}  C={data['conc']}")
 
-    #PHASE 2 sum FID
-    if 0.3 <= phase < 0.45:
+#PHASE 2 sum FID
+def phase2(phase):
+
+    if last_stage[0] != "sum":
+        last_stage[0] = "sum"
 
-        sum_black.set_data(t, np.real(real_sum))
+        sum_black.set_data(t, real_sum_re)
 
         for n in molecules:
             black_lines[n].set_data([],[])
             labels_real[n].set_text("")
 
-    #PHASE 3 basis appear
-    if 0.45 <= phase < 0.65:
+#PHASE 3 basis appear
+def phase3(phase):
+
+    if last_stage[0] != "basis":
+        last_stage[0] = "basis"
 
         for i,(name,data) in enumerate(molecules.items()):
 
-            y = np.real(basis_fids[name])
+            y = basis_fids_re[name]
             red_lines[name].set_data(t, y)
 
             labels_basis[name].set_position((0.25, 18-4*i))
             labels_basis[name].set_text("1 AU")
 
-    #PHASE 4 scaling
-    if 0.65 <= phase < 0.9:
+#PHASE 4 scaling
+def phase4(phase):
 
-        s = (phase-0.65)/0.25
+    s = (phase-0.65)/0.25
 
-        for i,(name,data) in enumerate(molecules.items()):
+    for name in molecules:
+        y = real_fids_re[name]*s   # basis × conc is the real FID
+        red_lines[name].set_data(t, y)
 
-            y = np.real(basis_fids[name]*data["conc"]*s)
-            red_lines[name].set_data(t, y)
+    # labels are fixed for the whole phase
+    if last_stage[0] != "scale":
+        last_stage[0] = "scale"
 
+        for i,(name,data) in enumerate(molecules.items()):
             labels_basis[name].set_position((0.25, 18-4*i))
             labels_basis[name].set_text(f"{data['conc']:.1f} AU")
 
-    #PHASE 5 final fit
-    if phase >= 0.9:
+#PHASE 5 final fit
+def phase5(phase):
+
+    if last_stage[0] != "fit":
+        last_stage[0] = "fit"
 
-        fitted = sum(basis_fids[n]*molecules[n]["conc"] for n in molecules)
-        sum_red.set_data(t, np.real(fitted))
+        sum_red.set_data(t, real_sum_re)
 
-    return []
+# UPDATE
+def update(frame):
 
-ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps)
-ani.save("time_domain_basis_fit.gif", writer="pillow", fps=fps)
+    phase = frame/frames
+
+    if phase < 0.3:
+        phase1(phase)
+    elif phase < 0.45:
+        phase2(phase)
+    elif phase < 0.65:
+        phase3(phase)
+    elif phase < 0.9:
+        phase4(phase)
+    else:
+        phase5(phase)
+
+    return animated
+
+ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps, blit=True)
+ani.save("time_domain_basis_fit.gif", writer=GIF_WRITER, fps=fps)
 
 print("Saved: time_domain_basis_fit.gif")
@@ -22,30 +22,21 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+import mrs_common
+from mrs_common import BW, N, GIF_WRITER
+
 # GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
-freq = np.linspace(-400,400,N)
+freq = np.fft.rfftfreq(N, 1/BW)
 
 T2 = 0.15
-decay = np.exp(-t/T2)
 
 fps = 30
 seconds = 15
 frames = fps*seconds
 
-# multiplet builder
+# multiplet builder (cached in mrs_common, with this script's T2)
 def multiplet(center, pattern, J=7):
-    sig = np.zeros_like(t, dtype=complex)
-    n = len(pattern)
-
-    for i,a in enumerate(pattern):
-        offset = (i-(n-1)/2)*J
-        f = center + offset
-        sig += a*np.exp(1j*2*np.pi*f*t)
-
-    return sig*decay
+    return mrs_common.multiplet(center, pattern, J, T2)
 
 
 # DEFINE MOLECULES
@@ -80,10 +71,13 @@ molecules = {
 real_specs = {}
 basis_specs = {}
 
-for name,data in molecules.items():
+# one batched FFT over all molecules → (n_molecules, N//2+1)
+# only the positive-frequency half is displayed, so a real FFT
+# of the real FID is enough
+mol_fids = np.stack([sum(data["peaks"]) for data in molecules.values()])
+mol_specs = np.abs(np.fft.rfft(np.real(mol_fids), axis=1))
 
-    mol_sum = sum(data["peaks"])
-    spec = np.abs(np.fft.fftshift(np.fft.fft(mol_sum)))
+for (name,data),spec in zip(molecules.items(), mol_specs):
 
     basis = spec/spec.max()
     real  = basis * data["conc"]
@@ -111,15 +105,22 @@ sum_red,   = ax.plot([],[], color="red", lw=2, ls="--")
 labels_real = {n: ax.text(0,0,"", fontsize=9, ha="center") for n in molecules}
 labels_basis= {n: ax.text(0,0,"", fontsize=8, color="red", ha="center") for n in molecules}
 
-# UPDATE
-def update(frame):
+# every artist update() may change (blitting redraws only these)
+animated = (list(black_lines.values()) + list(red_lines.values())
+            + [sum_black, sum_red]
+            + list(labels_real.values()) + list(labels_basis.values()))
 
-    phase = frame/frames
+# last static stage drawn (phase, molecules shown), so labels and
+# lines that do not change are only set when the stage changes
+last_stage = [None]
 
-    # PHASE 1 — real peaks appear
-    if phase < 0.3:
+# PHASE 1 — real peaks appear
+def phase1(phase):
 
-        k = int((phase/0.3)*len(molecules))
+    k = int((phase/0.3)*len(molecules))
+
+    if last_stage[0] != ("real", k):
+        last_stage[0] = ("real", k)
 
         for i,(name,data) in enumerate(molecules.items()):
 
@@ -140,8 +141,11 @@ def update(frame):
                 labels_real[name].set_position((x0,y0))
                 labels_real[name].set_text(txt)
 
-    # PHASE 2 — sum
-    if 0.3 <= phase < 0.45:
+# PHASE 2 — sum
+def phase2(phase):
+
+    if last_stage[0] != "sum":
+        last_stage[0] = "sum"
 
         sum_black.set_data(freq, real_sum)
 
@@ -150,8 +154,11 @@ def update(frame):
             black_lines[n].set_data([],[])
             labels_real[n].set_text("")
 
-    # PHASE 3 — basis appear
-    if 0.45 <= phase < 0.65:
+# PHASE 3 — basis appear
+def phase3(phase):
+
+    if last_stage[0] != "basis":
+        last_stage[0] = "basis"
 
         for name in molecules:
             y = basis_specs[name]
@@ -163,30 +170,55 @@ def update(frame):
             labels_basis[name].set_position((x0,y0))
             labels_basis[name].set_text("1 AU")
 
-    # PHASE 4 — scaling
-    if 0.65 <= phase < 0.9:
+# PHASE 4 — scaling
+def phase4(phase):
 
-        s = (phase-0.65)/0.25
+    s = (phase-0.65)/0.25
 
-        for name,data in molecules.items():
+    for name,data in molecules.items():
 
-            y = basis_specs[name] * data["conc"] * s
-            red_lines[name].set_data(freq, y)
+        y = real_specs[name] * s   # basis × conc is the real spectrum
+        red_lines[name].set_data(freq, y)
 
-            x0 = freq[np.argmax(y)]
-            y0 = y.max()*1.05
+        x0 = freq[np.argmax(y)]
+        y0 = y.max()*1.05
 
-            labels_basis[name].set_position((x0,y0))
+        labels_basis[name].set_position((x0,y0))
+
+    # label text is fixed for the whole phase
+    if last_stage[0] != "scale":
+        last_stage[0] = "scale"
+
+        for name,data in molecules.items():
             labels_basis[name].set_text(f"{data['conc']:.1f} AU")
 
-    # PHASE 5 — final fit
-    if phase >= 0.9:
-        fitted = sum(basis_specs[n]*molecules[n]["conc"] for n in molecules)
-        sum_red.set_data(freq, fitted)
+# PHASE 5 — final fit
+def phase5(phase):
+
+    if last_stage[0] != "fit":
+        last_stage[0] = "fit"
 
-    return []
+        sum_red.set_data(freq, real_sum)
 
-ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps)
-ani.save("basis_fit_clean.gif", writer="pillow", fps=fps)
+# UPDATE
+def update(frame):
+
+    phase = frame/frames
+
+    if phase < 0.3:
+        phase1(phase)
+    elif phase < 0.45:
+        phase2(phase)
+    elif phase < 0.65:
+        phase3(phase)
+    elif phase < 0.9:
+        phase4(phase)
+    else:
+        phase5(phase)
+
+    return animated
+
+ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps, blit=True)
+ani.save("basis_fit_clean.gif", writer=GIF_WRITER, fps=fps)
 
 print("Saved: basis_fit_clean.gif")
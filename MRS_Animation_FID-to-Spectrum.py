@@ -22,54 +22,47 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+from mrs_common import BW, N, t, make_decay, multiplet, GIF_WRITER
+
 # GLOBAL PARAMETERS
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
 T2 = 0.3
-decay = np.exp(-t/T2)
-freq_axis = np.linspace(-BW/2, BW/2, N)
+decay = make_decay(T2)
+freq_axis = np.fft.rfftfreq(N, 1/BW)
 
 # animation length control
 animation_seconds = 12     # <= change to 10–15
 fps = 25
 frames = animation_seconds * fps
 
-# MULTIPLET FUNCTION
-def multiplet(freqs, amps):
-    signal = np.zeros_like(t, dtype=complex)
-    for f,a in zip(freqs, amps):
-        signal += a*np.exp(1j*2*np.pi*f*t)
-    return signal
+# animation frame → FID length (acquired samples)
+idx_of = np.arange(frames)*N//frames
 
 # BUILD MOLECULE TYPES
 def molecule_type(kind):
 
     if kind == 1:
-        singlet = multiplet([80],[1])
+        singlet = multiplet(80,[1])
         J=7
-        doublet = multiplet([200-J/2,200+J/2],[1,1])
+        doublet = multiplet(200,[1,1],J)
         return (singlet+doublet)*decay, "singlet + doublet"
 
     if kind == 2:
-        singlet = multiplet([80],[1])
+        singlet = multiplet(80,[1])
         J=7
-        doublet = multiplet([180-J/2,180+J/2],[1,1])
-        triplet = multiplet([300-J,300,300+J],[1,2,1])
+        doublet = multiplet(180,[1,1],J)
+        triplet = multiplet(300,[1,2,1],J)
         return (singlet+doublet+triplet)*decay, "singlet + doublet + triplet"
 
     if kind == 3:
         J=7
-        complex_peak = multiplet(
-            [250-1.5*J,250-0.5*J,250+0.5*J,250+1.5*J],
-            [1,3,3,1]
-        )
+        complex_peak = multiplet(250,[1,3,3,1],J)
         return complex_peak*decay, "complex quartet"
 
 # ANIMATION FUNCTION
 def create_animation(kind):
 
     fid, title = molecule_type(kind)
+    fid_re = np.real(fid)   # displayed trace, reused every frame
 
     fig, (ax1, ax2) = plt.subplots(2,1, figsize=(7,6))
 
@@ -81,30 +74,33 @@ def create_animation(kind):
     ax1.set_ylim(-3,3)
 
     ax2.set_title(f"Spectrum building ({title})")
-    ax2.set_xlim(-400,400)
+    ax2.set_xlim(0,400)
 
-    full_spec = np.abs(np.fft.fftshift(np.fft.fft(fid)))
+    # one-sided spectrum of the displayed (real) FID
+    full_spec = np.abs(np.fft.rfft(fid_re))
     ax2.set_ylim(0, full_spec.max()*1.1)
 
-    def update(frame):
-        # map animation frame → FID length
-        idx = int((frame/frames)*N)
+    # precompute every truncated spectrum with one batched FFT
+    padded = np.zeros((frames, N), dtype=np.float32)
+    for f,idx in enumerate(idx_of):
+        padded[f,:idx] = fid_re[:idx]
 
-        current = fid[:idx]
-        padded = np.zeros(N, dtype=complex)
-        padded[:idx] = current
+    specs = np.abs(np.fft.rfft(padded, axis=1))
 
-        spec = np.abs(np.fft.fftshift(np.fft.fft(padded)))
+    # truncated FID per frame (views, no copies)
+    t_prefix = [t[:idx] for idx in idx_of]
+    fid_prefix = [fid_re[:idx] for idx in idx_of]
 
-        line_fid.set_data(t[:idx], np.real(current))
-        line_spec.set_data(freq_axis, spec)
+    def update(frame):
+        line_fid.set_data(t_prefix[frame], fid_prefix[frame])
+        line_spec.set_data(freq_axis, specs[frame])
 
         return line_fid, line_spec
 
-    ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps)
+    ani = FuncAnimation(fig, update, frames=frames, interval=1000/fps, blit=True)
 
     filename = f"mrs_animation_{kind}.gif"
-    ani.save(filename, writer="pillow", fps=fps)
+    ani.save(filename, writer=GIF_WRITER, fps=fps)
 
     plt.close()
     print("Saved:", filename)
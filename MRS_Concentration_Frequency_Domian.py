@@ -22,25 +22,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+from mrs_common import BW, N, t, multiplet, GIF_WRITER
+
 # GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
 freq_axis = np.linspace(-BW/2, BW/2, N)
 
 T2 = 0.25
-decay = np.exp(-t/T2)
 
 fps = 25
 frames = 250
 
-# multiplet builder
-def multiplet(freqs, amps):
-    s = np.zeros_like(t, dtype=complex)
-    for f,a in zip(freqs, amps):
-        s += a*np.exp(1j*2*np.pi*f*t)
-    return s
-
 # molecule cases
 def build_case(kind):
 
@@ -48,26 +39,26 @@ def build_case(kind):
     labels = []
 
     if kind == 1:
-        parts.append(multiplet([80],[1])*decay)
+        parts.append(multiplet(80,[1],T2=T2))
         labels.append("Singlet")
 
     if kind == 2:
-        parts.append(multiplet([80],[1])*decay)
+        parts.append(multiplet(80,[1],T2=T2))
         labels.append("Singlet")
 
         J=7
-        parts.append(multiplet([200-J/2,200+J/2],[1,1])*decay)
+        parts.append(multiplet(200,[1,1],J,T2))
         labels.append("Doublet")
 
     if kind == 3:
-        parts.append(multiplet([80],[1])*decay)
+        parts.append(multiplet(80,[1],T2=T2))
         labels.append("Singlet")
 
         J=7
-        parts.append(multiplet([200-J/2,200+J/2],[1,1])*decay)
+        parts.append(multiplet(200,[1,1],J,T2))
         labels.append("Doublet")
 
-        parts.append(multiplet([320-1.5*J,320-0.5*J,320+0.5*J,320+1.5*J],[1,3,3,1])*decay)
+        parts.append(multiplet(320,[1,3,3,1],J,T2))
         labels.append("Multiplet")
 
     return parts, labels
@@ -77,6 +68,7 @@ def animate_case(kind):
 
     parts, labels = build_case(kind)
     total_fid = sum(parts)
+    total_re = np.real(total_fid)   # displayed trace, reused every frame
 
     fig, (ax1, ax2) = plt.subplots(2,1, figsize=(7,6))
 
@@ -98,12 +90,12 @@ def animate_case(kind):
         idx = int((frame/frames)*N)
 
         current = total_fid[:idx]
-        padded = np.zeros(N, dtype=complex)
+        padded = np.zeros(N, dtype=np.complex64)
         padded[:idx] = current
 
         spec = np.abs(np.fft.fftshift(np.fft.fft(padded)))
 
-        line_fid.set_data(t[:idx], np.real(current))
+        line_fid.set_data(t[:idx], total_re[:idx])
         line_spec.set_data(freq_axis, spec)
 
         # remove old fill
@@ -120,7 +112,7 @@ def animate_case(kind):
         # contribution per part
         for p,l in zip(parts, labels):
 
-            padded_p = np.zeros(N, dtype=complex)
+            padded_p = np.zeros(N, dtype=np.complex64)
             padded_p[:idx] = p[:idx]
 
             spec_p = np.abs(np.fft.fftshift(np.fft.fft(padded_p)))
@@ -135,12 +127,12 @@ def animate_case(kind):
 
         ax2.set_ylabel(text)
 
-        return line_fid, line_spec
+        return line_fid, line_spec, fill
 
     ani = FuncAnimation(fig, update, frames=frames, interval=40)
 
     name = f"mrs_concentration_case{kind}.gif"
-    ani.save(name, writer="pillow", fps=fps)
+    ani.save(name, writer=GIF_WRITER, fps=fps)
     plt.close()
 
     print("Saved:", name)
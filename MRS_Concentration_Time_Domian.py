@@ -27,23 +27,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
-# GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
+from mrs_common import N, t, multiplet, GIF_WRITER
 
+# GLOBAL
 T2 = 0.25
-decay = np.exp(-t/T2)
 
 fps = 25
 frames = 250
 
-# multiplet builder
-def multiplet(freqs, amps):
-    s = np.zeros_like(t, dtype=complex)
-    for f,a in zip(freqs, amps):
-        s += a*np.exp(1j*2*np.pi*f*t)
-    return s
+# animation frame → FID length (acquired samples)
+idx_of = np.arange(frames)*N//frames
 
 # molecule cases
 def build_case(kind):
@@ -52,22 +45,17 @@ def build_case(kind):
     labels = []
 
     if kind >= 1:
-        parts.append(multiplet([80],[1])*decay)
+        parts.append(multiplet(80,[1],T2=T2))
         labels.append("Singlet")
 
     if kind >= 2:
         J=7
-        parts.append(multiplet([200-J/2,200+J/2],[1,1])*decay)
+        parts.append(multiplet(200,[1,1],J,T2))
         labels.append("Doublet")
 
     if kind >= 3:
         J=7
-        parts.append(
-            multiplet(
-                [320-1.5*J,320-0.5*J,320+0.5*J,320+1.5*J],
-                [1,3,3,1]
-            )*decay
-        )
+        parts.append(multiplet(320,[1,3,3,1],J,T2))
         labels.append("Multiplet")
 
     return parts, labels
@@ -78,6 +66,10 @@ def animate_case(kind):
     parts, labels = build_case(kind)
     total_fid = sum(parts)
 
+    # displayed traces, reused every frame
+    total_re = np.real(total_fid)
+    parts_re = [np.real(p) for p in parts]
+
     # ---- layout with side text panel ----
     fig = plt.figure(figsize=(9,4))
     gs = fig.add_gridspec(1,2, width_ratios=[2,1])
@@ -95,39 +87,37 @@ def animate_case(kind):
     ax.set_xlabel("Time (s)")
     ax.set_ylabel("Signal")
 
-    text_obj = ax_text.text(0.02, 0.95, "", va="top", fontsize=12)
+    # ---- amplitude at t=0 ----
+    # S(0) never changes during the animation, so the panel is static
+    total_amp = np.abs(total_fid[0])
 
-    def update(frame):
-
-        idx = int((frame/frames)*N)
+    text = "Concentration from FID\n"
+    text += "---------------------------\n"
+    text += "C ∝ S(0)\n\n"
+    text += f"Total amplitude:\n{total_amp:.2f}\n\n"
 
-        current = total_fid[:idx]
-        line_total.set_data(t[:idx], np.real(current))
+    for p,l in zip(parts, labels):
+        amp = np.abs(p[0])
+        frac = 100*amp/total_amp if total_amp>0 else 0
+        text += f"{l}: {frac:.1f}%\n"
 
-        for p,line in zip(parts, part_lines):
-            line.set_data(t[:idx], np.real(p[:idx]))
+    ax_text.text(0.02, 0.95, text, va="top", fontsize=12)
 
-        # ---- amplitude at t=0 ----
-        total_amp = np.abs(total_fid[0])
+    def update(frame):
 
-        text = "Concentration from FID\n"
-        text += "---------------------------\n"
-        text += "C ∝ S(0)\n\n"
-        text += f"Total amplitude:\n{total_amp:.2f}\n\n"
+        idx = idx_of[frame]
 
-        for p,l in zip(parts, labels):
-            amp = np.abs(p[0])
-            frac = 100*amp/total_amp if total_amp>0 else 0
-            text += f"{l}: {frac:.1f}%\n"
+        line_total.set_data(t[:idx], total_re[:idx])
 
-        text_obj.set_text(text)
+        for p,line in zip(parts_re, part_lines):
+            line.set_data(t[:idx], p[:idx])
 
-        return [line_total, text_obj] + part_lines
+        return [line_total] + part_lines
 
-    ani = FuncAnimation(fig, update, frames=frames, interval=40)
+    ani = FuncAnimation(fig, update, frames=frames, interval=40, blit=True)
 
     name = f"mrs_time_concentration_case{kind}.gif"
-    ani.save(name, writer="pillow", fps=fps)
+    ani.save(name, writer=GIF_WRITER, fps=fps)
     plt.close(fig)
 
     print("Saved:", name)
@@ -28,6 +28,8 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
+from mrs_common import GIF_WRITER
+
 
 # USER SETTINGS
 
@@ -115,6 +117,6 @@ def update(frame):
 ani = FuncAnimation(fig, update, frames=total_frames, interval=50)
 
 # Save GIF
-ani.save("PRESS_voxel_animation_Updated.gif", writer="pillow", fps=fps)
+ani.save("PRESS_voxel_animation_Updated.gif", writer=GIF_WRITER, fps=fps)
 
 plt.show()
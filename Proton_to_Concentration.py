@@ -22,14 +22,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+from mrs_common import BW, N, t, make_decay, GIF_WRITER
+
 # GLOBAL
-BW = 2000
-N = 2048
-t = np.arange(N)/BW
 freq_axis = np.linspace(-BW/2, BW/2, N)
 
 T2 = 0.25
-decay = np.exp(-t/T2)
+decay = make_decay(T2)
 
 fps = 25
 frames = 200
@@ -38,13 +37,28 @@ frames = 200
 def fid_signal(scale):
     return scale * np.exp(1j*2*np.pi*100*t) * decay
 
+# FID, spectrum and area are all linear in the proton count,
+# so compute them once for a single proton and rescale per frame
+base_fid = fid_signal(1.0)
+base_real = np.real(base_fid)
+base_spec = np.abs(np.fft.fftshift(np.fft.fft(base_fid)))
+base_area = np.trapz(base_spec, freq_axis)
+
+# outline of the area under the base spectrum (closed on the baseline)
+base_verts = np.column_stack([
+    np.r_[freq_axis[0], freq_axis, freq_axis[-1]],
+    np.r_[0, base_spec, 0],
+])
+
 # animation
 fig, (ax1, ax2) = plt.subplots(2,1, figsize=(7,6))
 plt.subplots_adjust(hspace=0.4)
 
 line_fid, = ax1.plot([],[], lw=2)
 line_spec, = ax2.plot([],[], lw=2)
-fill = None
+
+# area fill is created once and reshaped every frame
+fill = ax2.fill_between(freq_axis, base_spec, alpha=0.3)
 
 ax1.set_xlim(0,0.4)
 ax1.set_ylim(-6,6)
@@ -58,26 +72,20 @@ text_box = fig.text(0.72,0.55,"", fontsize=12,
                     bbox=dict(facecolor='white', alpha=0.9))
 
 def update(frame):
-    global fill
 
     # proton count increases
     scale = 1 + 4*(frame/frames)
 
-    fid = fid_signal(scale)
-
-    spec = np.abs(np.fft.fftshift(np.fft.fft(fid)))
+    spec = scale*base_spec
 
-    line_fid.set_data(t, np.real(fid))
+    line_fid.set_data(t, scale*base_real)
     line_spec.set_data(freq_axis, spec)
 
-    # remove old fill
-    if fill:
-        fill.remove()
-
-    fill = ax2.fill_between(freq_axis, spec, alpha=0.3)
+    # rescale the existing fill polygon
+    fill.set_verts([base_verts*[1, scale]])
 
     # area
-    area = np.trapz(spec, freq_axis)
+    area = scale*base_area
 
     text = (
         f"Number of protons: {scale:.1f}\n\n"
@@ -89,9 +97,9 @@ def update(frame):
 
     text_box.set_text(text)
 
-    return line_fid, line_spec
+    return line_fid, line_spec, fill, text_box
 
 ani = FuncAnimation(fig, update, frames=frames, interval=40)
 
-ani.save("protons_area_amplitude.gif", writer="pillow", fps=fps)
+ani.save("protons_area_amplitude.gif", writer=GIF_WRITER, fps=fps)
 print("Saved: protons_area_amplitude.gif")
@@ -25,6 +25,8 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from mpl_toolkits.mplot3d import Axes3D
 
+from mrs_common import GIF_WRITER
+
 # SETTINGS
 fps = 30
 seconds = 20
@@ -36,16 +38,43 @@ TE_frame = int(frames * 0.35)
 n_spins = 6
 T2 = 250  # decay speed
 
+# transverse decay envelope per frame (1 until the RF pulse)
+decay_table = np.exp(-(np.arange(frames)-rf_frame).clip(0)/T2)
+
 # INITIAL SPINS
 phases = np.random.rand(n_spins) * 2*np.pi
 freq_offsets = np.linspace(-0.1,0.1,n_spins)
 
-# magnetization vectors
-Mx = np.zeros(n_spins)
-My = np.zeros(n_spins)
-Mz = np.ones(n_spins)
+# BLOCH TRAJECTORY
+# the whole evolution is deterministic, so every frame is computed
+# up front as (frames, n_spins) arrays and update() only plots
+Mx_all = np.zeros((frames, n_spins))
+My_all = np.zeros((frames, n_spins))
+Mz_all = np.zeros((frames, n_spins))
+
+# before RF: aligned with B0
+Mz_all[:rf_frame] = 1
+
+# RF pulse (90°): tipped onto x
+Mx_all[rf_frame] = 1
+
+# after RF: precession with per-spin offsets and T2 decay
+ages = np.arange(1, frames-rf_frame)[:,None]
+phi = phases[None,:] + ages*(0.3 + freq_offsets)[None,:]
+env = decay_table[rf_frame+1:, None]
 
-fid = []
+Mx_all[rf_frame+1:] = env*np.cos(phi)
+My_all[rf_frame+1:] = env*np.sin(phi)
+
+# net magnetization and the recorded FID (net Mx after the pulse)
+M_net_all = np.column_stack([Mx_all.sum(axis=1),
+                             My_all.sum(axis=1),
+                             Mz_all.sum(axis=1)]) / n_spins
+fid_all = np.where(np.arange(frames) > rf_frame, Mx_all.sum(axis=1), 0)
+
+# FID x-axis per frame: the recorded trace is stretched over the full
+# plot width, so each frame has its own axis of frame+1 points
+fid_x = [np.linspace(0, seconds, frame+1) for frame in range(frames)]
 
 # FIGURE
 fig = plt.figure(figsize=(10,5))
@@ -59,82 +88,55 @@ ax_fid.set_title("FID")
 
 fid_line, = ax_fid.plot([],[], lw=2)
 
-# UPDATE
-def update(frame):
-
-    global Mx,My,Mz,phases
+# static 3D scene (drawn once, kept across frames)
+ax3d.set_xlim(-1,1)
+ax3d.set_ylim(-1,1)
+ax3d.set_zlim(-1,1)
+ax3d.set_title("Spin precession (Bloch view)")
 
-    ax3d.cla()
-    ax3d.set_xlim(-1,1)
-    ax3d.set_ylim(-1,1)
-    ax3d.set_zlim(-1,1)
-    ax3d.set_title("Spin precession (Bloch view)")
+# B0 field
+ax3d.quiver(0,0,-1,0,0,2,color="green",linewidth=2)
+ax3d.text(0,0,1.1,"B0",color="green")
 
-    # B0 field
-    ax3d.quiver(0,0,-1,0,0,2,color="green",linewidth=2)
-    ax3d.text(0,0,1.1,"B0",color="green")
+# spin + net magnetization arrows, replaced every frame
+spin_q = None
+net_q = None
 
-    # BEFORE RF
-    if frame < rf_frame:
+# origin of every spin arrow
+origin = np.zeros(n_spins)
 
-        for i in range(n_spins):
-            Mx[i] = 0
-            My[i] = 0
-            Mz[i] = 1
-
-    # RF pulse (90°)
-    elif frame == rf_frame:
-        Mx[:] = 1
-        My[:] = 0
-        Mz[:] = 0
-
-    # AFTER RF
-    else:
-
-        for i in range(n_spins):
+# UPDATE
+def update(frame):
 
-            phases[i] += 0.3 + freq_offsets[i]
-            decay = np.exp(-(frame-rf_frame)/T2)
+    global spin_q,net_q
 
-            Mx[i] = decay*np.cos(phases[i])
-            My[i] = decay*np.sin(phases[i])
-            Mz[i] = 0
+    # remove previous arrows
+    if spin_q:
+        spin_q.remove()
+        net_q.remove()
 
-    # draw spins
-    for i in range(n_spins):
-        ax3d.quiver(0,0,0,Mx[i],My[i],Mz[i],
-                    color="blue",alpha=0.6)
+    # draw spins (one quiver for all of them)
+    spin_q = ax3d.quiver(origin,origin,origin,
+                         Mx_all[frame],My_all[frame],Mz_all[frame],
+                         color="blue",alpha=0.6)
 
     # net magnetization
-    Mx_net = np.sum(Mx)
-    My_net = np.sum(My)
-    Mz_net = np.sum(Mz)
-
-    ax3d.quiver(0,0,0,Mx_net/n_spins,
-                My_net/n_spins,
-                Mz_net/n_spins,
-                color="red",linewidth=3)
+    net_q = ax3d.quiver(0,0,0,*M_net_all[frame],
+                        color="red",linewidth=3)
 
     # FID
-    if frame > rf_frame:
-        signal = Mx_net
-        fid.append(signal)
-    else:
-        fid.append(0)
-
     if frame > TE_frame:
-        xdata = np.linspace(0, seconds, len(fid))
-        fid_line.set_data(xdata, fid)
+        fid_line.set_data(fid_x[frame], fid_all[:frame+1])
         ax_fid.set_title("FID recording")
     else:
         ax_fid.set_title("Waiting for TE")
         fid_line.set_data([],[])
 
-    return []
+    return spin_q, net_q, fid_line
 
 ani = FuncAnimation(fig, update, frames=frames,
                     interval=1000/fps)
 
-ani.save("bloch_3D_FID.gif", writer="pillow", fps=fps)
+ani.save("bloch_3D_FID.gif", writer=GIF_WRITER, fps=fps)
 
 print("Saved: bloch_3D_FID.gif")
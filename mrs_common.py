@@ -0,0 +1,109 @@
+# Shared acquisition grid and signal builders for the MRS animation scripts.
+#
+# Provides:
+# - BW, N and the time axis t used by every FID-based animation
+# - make_decay(T2): exponential T2 envelope on t
+# - multiplet(center, pattern, J, T2): J-coupled multiplet FID
+# - GIF_WRITER: animation writer used to save the GIFs
+#
+# Decay envelopes and multiplets are cached, so identical peaks built
+# for several cases (or several scripts run in one session) are only
+# computed once. Cached arrays are read-only; combine them into new
+# arrays rather than modifying them in place.
+#
+# Created by: Arijit Bhattacharya
+# PhD Scholar, Mind-Brain-Body-Society Lab
+# Department of Psychology and Cognitive Sciences
+# Ashoka University
+#
+# Licensed under the MIT License (see LICENSE file for details)
+
+import functools
+
+import numpy as np
+from matplotlib.animation import writers
+
+# ACQUISITION
+BW = 2000
+N = 2048
+T2_DEFAULT = 0.25
+
+# multiplets with at least this many lines use the Numba kernel (if
+# numba is installed); smaller ones stay on the vectorized NumPy path,
+# where JIT compilation would cost more than it saves
+NUMBA_MIN_LINES = 16
+
+t = (np.arange(N)/BW).astype(np.float32)   # float32 is plenty for plotting
+t.flags.writeable = False
+
+# GIF encoder: ffmpeg (palette-based) when installed, else pillow
+GIF_WRITER = "ffmpeg" if writers.is_available("ffmpeg") else "pillow"
+
+
+def _frozen(a):
+    a.flags.writeable = False
+    return a
+
+
+# T2 decay envelope
+@functools.lru_cache(maxsize=None)
+def make_decay(T2=T2_DEFAULT):
+    return _frozen(np.exp(-t/T2))
+
+
+# optional JIT kernel for large multiplets; numba is only imported
+# the first time one is built (None when numba is not installed)
+@functools.lru_cache(maxsize=None)
+def _numba_kernel():
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    # line sum and decay fused into one pass over t, without
+    # materializing an (n, N) array of complex exponentials
+    @njit(fastmath=True, cache=True, parallel=True)
+    def _multiplet_nb(t, decay, center, pattern, J):
+        n = pattern.size
+        w = 2*np.pi*(center + (np.arange(n)-(n-1)/2)*J)
+        out = np.empty(t.size, dtype=np.complex64)
+        for k in prange(t.size):
+            acc = 0j
+            for i in range(n):
+                acc += pattern[i]*(np.cos(w[i]*t[k]) + 1j*np.sin(w[i]*t[k]))
+            out[k] = acc*decay[k]
+        return out
+
+    return _multiplet_nb
+
+
+@functools.lru_cache(maxsize=None)
+def _multiplet(center, pattern, J, T2):
+    kernel = _numba_kernel() if len(pattern) >= NUMBA_MIN_LINES else None
+
+    if kernel is not None:
+        decay = make_decay(T2) if T2 is not None else np.ones_like(t)
+        pattern = np.asarray(pattern, dtype=np.float64)
+        return _frozen(kernel(t, decay, float(center), pattern, float(J)))
+
+    n = len(pattern)
+
+    # all lines of the multiplet in one broadcasted exp → (n, N)
+    offsets = (np.arange(n)-(n-1)/2)*J
+    freqs = (center + offsets).astype(np.float32)
+    phase = 2j*np.pi*np.outer(freqs, t)
+    # weighted line sum as one matvec (no weighted (n, N) temporary),
+    # decay applied in place on the result
+    sig = np.asarray(pattern, dtype=np.float32) @ np.exp(phase)
+
+    if T2 is not None:
+        sig *= make_decay(T2)
+
+    return _frozen(sig)
+
+
+# multiplet → FID
+# lines of relative intensity `pattern`, spaced J Hz around `center`;
+# T2=None leaves the FID undamped, otherwise make_decay(T2) is applied
+def multiplet(center, pattern, J=7, T2=None):
+    return _multiplet(center, tuple(pattern), J, T2)